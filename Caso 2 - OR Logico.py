@@ -1,5 +1,7 @@
 import numpy as np
 
+from tabla_verdad import generar_tabla, entrenar_tabla, evaluar_tabla, compuerta_or
+
 class Perceptron:
     def __init__(self, tasa_aprendizaje=0.1, iteraciones=10):
         self.tasa_aprendizaje = tasa_aprendizaje
@@ -26,24 +28,31 @@ class Perceptron:
 
     def predecir(self, entradas):
         salida_lineal = np.dot(entradas, self.pesos) + self.sesgo
-        return np.array([self.funcion_activacion(x) for x in salida_lineal])
+        return np.where(salida_lineal >= 0, 1, 0)
 
-# Datos para compuerta lógica OR
-entradas_or = np.array([[0, 0], [0, 1], [1, 0], [1, 1]])
-salidas_or = np.array([0, 1, 1, 1])
+# Número de entradas de la compuerta (la tabla de verdad tiene 2^N filas)
+N_ENTRADAS = 2
+# La tabla completa solo se genera y se muestra si es pequeña
+MAX_ENTRADAS_MOSTRAR = 4
 
 # Crear el perceptrón
 perceptron_or = Perceptron()
 
-# Entrenar el perceptrón con los datos OR
-perceptron_or.entrenar(entradas_or, salidas_or)
+# Entrenar el perceptrón con la tabla de verdad OR
+epocas, convergio = entrenar_tabla(perceptron_or, N_ENTRADAS, compuerta_or)
 
-# Evaluar el perceptrón
-predicciones = perceptron_or.predecir(entradas_or)
-precision = np.mean(predicciones == salidas_or) * 100
+# Evaluar el perceptrón con toda la tabla de verdad, por bloques
+aciertos = evaluar_tabla(perceptron_or, N_ENTRADAS, compuerta_or)
+precision = aciertos / 2 ** N_ENTRADAS * 100
 
-print("Predicciones OR:", predicciones)
+if N_ENTRADAS <= MAX_ENTRADAS_MOSTRAR:
+    entradas_or = generar_tabla(N_ENTRADAS)
+    print("Predicciones OR:", perceptron_or.predecir(entradas_or))
 print(f"Precisión del modelo: {precision:.2f}%")
+if convergio:
+    print(f"Linealmente separable: Sí (convergió en {epocas} épocas)")
+else:
+    print(f"Linealmente separable: no comprobado (sin converger tras {epocas} épocas)")
 print(f"Pesos finales: {perceptron_or.pesos}")
 print(f"Sesgo final: {perceptron_or.sesgo}")
 
@@ -52,14 +61,14 @@ print("\n--- Inserta valores para probar el perceptrón entrenado ---")
 print("Escribe 'salir' para terminar.\n")
 
 while True:
-    entrada_usuario = input("Introduce dos valores separados por espacio (ejemplo: 1 0): ")
+    entrada_usuario = input(f"Introduce {N_ENTRADAS} valores separados por espacio (ejemplo: {' '.join(['1'] * N_ENTRADAS)}): ")
     if entrada_usuario.lower() == 'salir':
         print("Finalizando ...")
         break
     try:
         valores = list(map(int, entrada_usuario.strip().split()))
-        if len(valores) != 2:
-            print("Por favor introduce exactamente dos valores (0 o 1).")
+        if len(valores) != N_ENTRADAS:
+            print(f"Por favor introduce exactamente {N_ENTRADAS} valores (0 o 1).")
             continue
         valores_array = np.array(valores)
         prediccion = perceptron_or.predecir(valores_array.reshape(1, -1))
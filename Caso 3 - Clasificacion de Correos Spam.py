@@ -1,5 +1,9 @@
+import os
 import random
 
+from checkpoints import cargar_checkpoint
+from entrenamiento import entrenar_epocas
+
 
 class PerceptronSpam:
     def __init__(self, max_length=100):
@@ -12,6 +16,8 @@ class PerceptronSpam:
         self.weights = [random.uniform(-1, 1) for _ in range(self.input_size)]
         self.bias = random.uniform(-1, 1)
         self.learning_rate = 0.01
+        # Posiciones de bits que siguen en uso tras compactar (None = todas)
+        self.indices_activos = None
 
     def texto_a_binario(self, mensaje):
         """
@@ -29,6 +35,74 @@ class PerceptronSpam:
         bits += [0] * (self.input_size - len(bits))
         return bits
 
+    def codificar(self, mensaje):
+        """
+        Convierte un mensaje a las entradas del perceptrón.
+        Si el modelo está compactado, solo calcula los bits activos.
+        """
+        if self.indices_activos is None:
+            return self.texto_a_binario(mensaje)
+
+        codigos = [ord(char) for char in mensaje[:self.max_length]]
+        if any(codigo > 255 for codigo in codigos):
+            # Caracteres de más de 8 bits desplazan las posiciones: usar la conversión completa
+            bits = self.texto_a_binario(mensaje)
+            return [bits[j] for j in self.indices_activos]
+
+        # Bit j = bit (7 - j % 8) del carácter j // 8, o 0 si es relleno
+        return [(codigos[j >> 3] >> (7 - (j & 7))) & 1 if (j >> 3) < len(codigos) else 0
+                for j in self.indices_activos]
+
+    def compactar(self, ejemplos, umbral=0.0, podar_constantes=False, min_ejemplos=1000):
+        """
+        Elimina las entradas que no aportan información:
+        - las que no pueden activarse en mensajes como los de entrenamiento:
+          el relleno más allá del mensaje más largo y, si todos los mensajes
+          son ASCII, el bit alto de cada carácter;
+        - las que tienen un peso de valor absoluto menor o igual que umbral
+          (con umbral=0.0, solo los pesos exactamente 0);
+        - con podar_constantes=True, además las que valen siempre lo mismo en
+          los ejemplos (su aporte se suma al sesgo). Con pocos ejemplos muchas
+          posiciones son constantes por casualidad, por eso exige min_ejemplos.
+        Con las opciones por defecto las predicciones sobre mensajes no más
+        largos que los de entrenamiento y con los mismos caracteres no cambian.
+        Devuelve el número de entradas eliminadas.
+        """
+        # Sin ejemplos todas las posiciones parecerían muertas y se eliminarían todos los pesos
+        if not ejemplos:
+            raise ValueError("compactar necesita al menos un ejemplo")
+        if podar_constantes and len(ejemplos) < min_ejemplos:
+            raise ValueError(f"podar_constantes necesita al menos {min_ejemplos} ejemplos")
+
+        # Bits que ocupa el mensaje más largo (los caracteres de más de 8 bits ocupan más)
+        longitud_bits = max((sum(len(f"{ord(char):08b}") for char in mensaje[:self.max_length])
+                             for mensaje in ejemplos), default=0)
+        solo_ascii = all(ord(char) < 128 for mensaje in ejemplos for char in mensaje[:self.max_length])
+
+        entradas = [self.codificar(mensaje) for mensaje in ejemplos] if podar_constantes else None
+        indices = self.indices_activos if self.indices_activos is not None else list(range(self.input_size))
+
+        activos = []
+        pesos = []
+        for posicion, (indice, peso) in enumerate(zip(indices, self.weights)):
+            # Posiciones muertas por construcción: valen 0 en todos los ejemplos
+            if indice >= longitud_bits or (solo_ascii and indice % 8 == 0):
+                continue
+            if abs(peso) <= umbral:
+                continue
+            if podar_constantes:
+                valores = {inputs[posicion] for inputs in entradas}
+                if len(valores) == 1:
+                    self.bias += peso * valores.pop()
+                    continue
+            activos.append(indice)
+            pesos.append(peso)
+
+        eliminadas = len(self.weights) - len(pesos)
+        self.indices_activos = activos
+        self.weights = pesos
+        return eliminadas
+
     def activacion(self, x):
         """Función de activación escalón (step function)"""
         return 1 if x >= 0 else 0
@@ -36,11 +110,14 @@ class PerceptronSpam:
     def predecir(self, mensaje):
         """Predice si el mensaje es spam (1) o no (0)"""
         # Convertir texto a binario
-        inputs = self.texto_a_binario(mensaje)
+        inputs = self.codificar(mensaje)
+        return self.predecir_codificado(inputs)
 
+    def predecir_codificado(self, inputs):
+        """Predice a partir de un mensaje ya convertido a binario"""
         # Calcular suma ponderada
         z = self.bias
-        for i in range(self.input_size):
+        for i in range(len(self.weights)):
             z += self.weights[i] * inputs[i]
 
         # Aplicar función de activación
@@ -51,7 +128,7 @@ class PerceptronSpam:
         Entrena el perceptrón con un solo ejemplo.
         etiqueta_real: 1 para spam, 0 para no spam.
         """
-        inputs = self.texto_a_binario(mensaje)
+        inputs = self.codificar(mensaje)
         for _ in range(max_epocas):
             prediccion = self.predecir(mensaje)
             error = etiqueta_real - prediccion
@@ -61,28 +138,67 @@ class PerceptronSpam:
                 break
 
             # Ajustar pesos y sesgo
-            for i in range(self.input_size):
+            for i in range(len(self.weights)):
                 self.weights[i] += self.learning_rate * error * inputs[i]
             self.bias += self.learning_rate * error
 
-    def entrenar_lote(self, ejemplos, etiquetas, max_epocas=100):
-        """Entrena con múltiples ejemplos"""
-        for _ in range(max_epocas):
-            errores = 0
-            for mensaje, etiqueta in zip(ejemplos, etiquetas):
-                inputs = self.texto_a_binario(mensaje)
-                prediccion = self.predecir(mensaje)
-                error = etiqueta - prediccion
-
-                if error != 0:
-                    errores += 1
-                    for i in range(self.input_size):
-                        self.weights[i] += self.learning_rate * error * inputs[i]
-                    self.bias += self.learning_rate * error
-
-            # Si no hay errores, terminar
-            if errores == 0:
-                break
+    def codificar_lote(self, ejemplos, directorio_cache=None):
+        """
+        Convierte una lista de mensajes a binario.
+        Si se indica directorio_cache, la matriz resultante se guarda en disco
+        y en ejecuciones posteriores con los mismos mensajes y el mismo
+        max_length se carga directamente sin volver a convertir. En ese caso
+        devuelve la matriz mapeada en memoria, sin copiarla: el entrenamiento
+        la recorre fila a fila, así que nunca tiene el corpus entero en listas.
+        """
+        if directorio_cache is None:
+            return [self.codificar(mensaje) for mensaje in ejemplos]
+
+        from cache_codificacion import cargar_o_codificar
+        parametros = {"esquema": "ascii-8bits", "max_length": self.max_length,
+                      "indices_activos": self.indices_activos}
+        return cargar_o_codificar(ejemplos, self.codificar, len(self.weights), parametros, directorio_cache)
+
+    def entrenar_lote(self, ejemplos, etiquetas, max_epocas=100, bolsillo=False, paciencia=None,
+                      directorio_cache=None, tiempo_limite=None, ruta_checkpoint=None, cada_epocas=1):
+        """
+        Entrena con múltiples ejemplos.
+        bolsillo: si es True, guarda los pesos de la época con menos errores
+        (algoritmo pocket) y los restaura al terminar.
+        paciencia: número de épocas sin mejorar el mínimo de errores tras el
+        cual se detiene el entrenamiento (None = sin límite).
+        directorio_cache: carpeta donde guardar/leer los mensajes ya convertidos.
+        tiempo_limite: segundos disponibles; al agotarse se detiene al final de la época.
+        ruta_checkpoint: archivo donde guardar el estado cada cada_epocas épocas,
+        para poder continuar luego con reanudar.
+        Devuelve True si el entrenamiento terminó y False si se detuvo por tiempo.
+        """
+        # Convertir cada mensaje a binario una sola vez
+        entradas = self.codificar_lote(ejemplos, directorio_cache)
+        return self.entrenar_codificado(entradas, etiquetas, max_epocas, bolsillo, paciencia,
+                                        tiempo_limite, ruta_checkpoint, cada_epocas)
+
+    def reanudar(self, ruta_checkpoint, ejemplos, etiquetas, directorio_cache=None, tiempo_limite=None,
+                 cada_epocas=1):
+        """
+        Continúa un entrenamiento de entrenar_lote desde su último checkpoint,
+        con las mismas opciones (max_epocas, bolsillo, paciencia) que tenía.
+        """
+        estado = cargar_checkpoint(ruta_checkpoint)
+        # Las entradas activas deben restaurarse antes de convertir los mensajes
+        self.indices_activos = estado["indices_activos"]
+        entradas = self.codificar_lote(ejemplos, directorio_cache)
+        return self.entrenar_codificado(entradas, etiquetas, tiempo_limite=tiempo_limite,
+                                        ruta_checkpoint=ruta_checkpoint, cada_epocas=cada_epocas, estado=estado)
+
+    def entrenar_codificado(self, entradas, etiquetas, max_epocas=100, bolsillo=False, paciencia=None,
+                            tiempo_limite=None, ruta_checkpoint=None, cada_epocas=1, estado=None):
+        """
+        Igual que entrenar_lote, pero con los mensajes ya convertidos a binario.
+        estado: checkpoint cargado desde el que continuar (lo usa reanudar).
+        """
+        return entrenar_epocas(self, entradas, etiquetas, max_epocas, bolsillo, paciencia,
+                               tiempo_limite, ruta_checkpoint, cada_epocas, estado)
 
 
 def modo_prueba(perceptron):
@@ -124,7 +240,9 @@ def main():
 
     # Entrenar con los datos predefinidos
     print("Entrenando con datos predefinidos...")
-    perceptron.entrenar_lote(mensajes_entrenamiento, etiquetas_entrenamiento)
+    # Si PERCEPTRON_CACHE apunta a una carpeta, los mensajes convertidos se guardan ahí
+    perceptron.entrenar_lote(mensajes_entrenamiento, etiquetas_entrenamiento,
+                             directorio_cache=os.environ.get("PERCEPTRON_CACHE"))
     print(f"Modelo entrenado con {len(mensajes_entrenamiento)} ejemplos")
 
     # Menú principal
@@ -1,5 +1,9 @@
+import time
+
 import numpy as np
 
+from checkpoints import guardar_checkpoint, cargar_checkpoint
+
 class Perceptron:
     def __init__(self, tasa_aprendizaje=0.01, iteraciones=100):
         self.tasa_aprendizaje = tasa_aprendizaje
@@ -10,12 +14,25 @@ class Perceptron:
     def funcion_activacion(self, x):
         return 1 if x >= 0 else 0
 
-    def entrenar(self, entradas, salidas):
+    def entrenar(self, entradas, salidas, tiempo_limite=None, ruta_checkpoint=None, cada_epocas=1, estado=None):
+        """
+        tiempo_limite: segundos disponibles; al agotarse se detiene al final de la época.
+        ruta_checkpoint: archivo donde guardar pesos, sesgo, época y estado aleatorio
+        cada cada_epocas épocas, para poder continuar luego con reanudar.
+        Devuelve True si completó todas las iteraciones y False si se detuvo por tiempo.
+        """
+        inicio = time.monotonic()
         n_muestras, n_caracteristicas = entradas.shape
-        self.pesos = np.zeros(n_caracteristicas)
-        self.sesgo = 0
+        if estado is None:
+            self.pesos = np.zeros(n_caracteristicas)
+            self.sesgo = 0
+            epoca_inicial = 0
+        else:
+            self.pesos, self.sesgo = estado["pesos"], estado["sesgo"]
+            np.random.set_state(estado["rng"])
+            epoca_inicial = estado["epoca"]
 
-        for _ in range(self.iteraciones):
+        for epoca in range(epoca_inicial, self.iteraciones):
             for indice, entrada in enumerate(entradas):
                 salida_lineal = np.dot(entrada, self.pesos) + self.sesgo
                 salida_predicha = self.funcion_activacion(salida_lineal)
@@ -24,6 +41,21 @@ class Perceptron:
                 self.pesos += actualizacion * entrada
                 self.sesgo += actualizacion
 
+            # Guardar el progreso y parar si se acabó el tiempo
+            tiempo_agotado = tiempo_limite is not None and time.monotonic() - inicio >= tiempo_limite
+            if ruta_checkpoint is not None and ((epoca + 1) % cada_epocas == 0 or tiempo_agotado
+                                                or epoca + 1 == self.iteraciones):
+                guardar_checkpoint(ruta_checkpoint, {"pesos": self.pesos, "sesgo": self.sesgo,
+                                                     "epoca": epoca + 1, "rng": np.random.get_state()})
+            if tiempo_agotado and epoca + 1 < self.iteraciones:
+                return False
+        return True
+
+    def reanudar(self, ruta_checkpoint, entradas, salidas, tiempo_limite=None, cada_epocas=1):
+        """Continúa un entrenamiento desde su último checkpoint"""
+        estado = cargar_checkpoint(ruta_checkpoint)
+        return self.entrenar(entradas, salidas, tiempo_limite, ruta_checkpoint, cada_epocas, estado)
+
     def predecir(self, entradas):
         salida_lineal = np.dot(entradas, self.pesos) + self.sesgo
         return np.array([self.funcion_activacion(x) for x in salida_lineal])
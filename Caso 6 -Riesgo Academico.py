@@ -1,6 +1,9 @@
 import random
 import math
 
+from checkpoints import cargar_checkpoint
+from entrenamiento import entrenar_epocas
+
 
 class PerceptronRiesgoAcademico:
     def __init__(self):
@@ -58,7 +61,10 @@ class PerceptronRiesgoAcademico:
         """Predice si el alumno está en alto riesgo (1) o bajo riesgo (0)"""
         inputs = self.preparar_entradas(llega_tarde, promedio_tareas, promedio_examenes, porcentaje_asistencia,
                                         es_sociable)
+        return self.predecir_codificado(inputs)
 
+    def predecir_codificado(self, inputs):
+        """Predice a partir de entradas ya preparadas con preparar_entradas"""
         # Calcular suma ponderada
         z = self.bias
         for i in range(self.input_size):
@@ -67,27 +73,42 @@ class PerceptronRiesgoAcademico:
         # Aplicar función de activación
         return self.activacion(z)
 
-    def entrenar(self, datos_entrenamiento, etiquetas, max_epocas=1000):
-        """Entrena el perceptrón con los datos de entrenamiento"""
-        for _ in range(max_epocas):
-            errores = 0
-            for datos, etiqueta in zip(datos_entrenamiento, etiquetas):
-                llega_tarde, promedio_tareas, promedio_examenes, porcentaje_asistencia, es_sociable = datos
-                inputs = self.preparar_entradas(llega_tarde, promedio_tareas, promedio_examenes, porcentaje_asistencia,
-                                                es_sociable)
-                z = sum(w * i for w, i in zip(self.weights, inputs)) + self.bias
-                prediccion = self.activacion(z)
-                error = etiqueta - prediccion
-
-                if error != 0:
-                    errores += 1
-                    for i in range(self.input_size):
-                        self.weights[i] += self.learning_rate * error * inputs[i]
-                    self.bias += self.learning_rate * error
-
-            # Si no hay errores, terminar antes
-            if errores == 0:
-                break
+    def entrenar(self, datos_entrenamiento, etiquetas, max_epocas=1000, bolsillo=False, paciencia=None,
+                 tiempo_limite=None, ruta_checkpoint=None, cada_epocas=1):
+        """
+        Entrena el perceptrón con los datos de entrenamiento.
+        bolsillo: si es True, guarda los pesos de la época con menos errores
+        (algoritmo pocket) y los restaura al terminar.
+        paciencia: número de épocas sin mejorar el mínimo de errores tras el
+        cual se detiene el entrenamiento (None = sin límite).
+        tiempo_limite: segundos disponibles; al agotarse se detiene al final de la época.
+        ruta_checkpoint: archivo donde guardar el estado cada cada_epocas épocas,
+        para poder continuar luego con reanudar.
+        Devuelve True si el entrenamiento terminó y False si se detuvo por tiempo.
+        """
+        # Convertir los datos de cada alumno a binario una sola vez
+        entradas = [self.preparar_entradas(*datos) for datos in datos_entrenamiento]
+        return self.entrenar_codificado(entradas, etiquetas, max_epocas, bolsillo, paciencia,
+                                        tiempo_limite, ruta_checkpoint, cada_epocas)
+
+    def reanudar(self, ruta_checkpoint, datos_entrenamiento, etiquetas, tiempo_limite=None, cada_epocas=1):
+        """
+        Continúa un entrenamiento desde su último checkpoint,
+        con las mismas opciones (max_epocas, bolsillo, paciencia) que tenía.
+        """
+        estado = cargar_checkpoint(ruta_checkpoint)
+        entradas = [self.preparar_entradas(*datos) for datos in datos_entrenamiento]
+        return self.entrenar_codificado(entradas, etiquetas, tiempo_limite=tiempo_limite,
+                                        ruta_checkpoint=ruta_checkpoint, cada_epocas=cada_epocas, estado=estado)
+
+    def entrenar_codificado(self, entradas, etiquetas, max_epocas=1000, bolsillo=False, paciencia=None,
+                            tiempo_limite=None, ruta_checkpoint=None, cada_epocas=1, estado=None):
+        """
+        Igual que entrenar, pero con entradas ya preparadas con preparar_entradas.
+        estado: checkpoint cargado desde el que continuar (lo usa reanudar).
+        """
+        return entrenar_epocas(self, entradas, etiquetas, max_epocas, bolsillo, paciencia,
+                               tiempo_limite, ruta_checkpoint, cada_epocas, estado)
 
 
 # Datos de entrenamiento predefinidos
@@ -0,0 +1,55 @@
+import hashlib
+import json
+import os
+import tempfile
+
+import numpy as np
+
+
+def clave_cache(ejemplos, parametros):
+    """
+    Calcula la clave del caché a partir del contenido de los ejemplos y de
+    los parámetros de codificación (max_length, esquema, ...).
+    Cualquier cambio en el texto, el orden o los parámetros cambia la clave.
+    """
+    resumen = hashlib.sha256()
+    resumen.update(json.dumps(parametros, sort_keys=True).encode("utf-8"))
+    for ejemplo in ejemplos:
+        datos = str(ejemplo).encode("utf-8")
+        # Prefijo de longitud para que ["ab", "c"] y ["a", "bc"] no coincidan
+        resumen.update(len(datos).to_bytes(8, "little"))
+        resumen.update(datos)
+    return resumen.hexdigest()
+
+
+def cargar_o_codificar(ejemplos, codificar, tamano, parametros, directorio):
+    """
+    Devuelve la matriz codificada (uint8, una fila por ejemplo) de los ejemplos.
+
+    Si el directorio ya tiene la matriz para este contenido y estos
+    parámetros, se abre con memoria mapeada (sin copiar ni recodificar).
+    Si no, se codifica cada ejemplo con codificar(ejemplo), se recorta a
+    tamano columnas y se guarda como .npy para las siguientes ejecuciones.
+    """
+    ejemplos = list(ejemplos)
+    ruta = os.path.join(directorio, clave_cache(ejemplos, parametros) + ".npy")
+
+    if os.path.exists(ruta):
+        return np.load(ruta, mmap_mode="r")
+
+    matriz = np.zeros((len(ejemplos), tamano), dtype=np.uint8)
+    for fila, ejemplo in enumerate(ejemplos):
+        matriz[fila] = codificar(ejemplo)[:tamano]
+
+    # Escribir en un archivo temporal y renombrar, para no dejar cachés a medias
+    os.makedirs(directorio, exist_ok=True)
+    descriptor, temporal = tempfile.mkstemp(suffix=".npy", dir=directorio)
+    try:
+        with os.fdopen(descriptor, "wb") as archivo:
+            np.save(archivo, matriz)
+        os.replace(temporal, ruta)
+    except BaseException:
+        os.remove(temporal)
+        raise
+
+    return np.load(ruta, mmap_mode="r")
@@ -0,0 +1,24 @@
+import os
+import pickle
+
+
+def guardar_checkpoint(ruta, estado):
+    """
+    Guarda el estado del entrenamiento (pesos, sesgo, época, estado del
+    generador aleatorio, ...) en ruta.
+    Se escribe primero en un archivo temporal y luego se renombra, para que
+    un proceso interrumpido a mitad de escritura no deje un checkpoint roto.
+    """
+    temporal = ruta + ".tmp"
+    with open(temporal, "wb") as archivo:
+        pickle.dump(estado, archivo)
+    os.replace(temporal, ruta)
+
+
+def cargar_checkpoint(ruta):
+    """
+    Carga un estado guardado con guardar_checkpoint.
+    Usa pickle: cargar solo checkpoints generados por uno mismo.
+    """
+    with open(ruta, "rb") as archivo:
+        return pickle.load(archivo)
@@ -0,0 +1,12 @@
+def codificar(modelo, ejemplo):
+    """
+    Convierte un ejemplo a la representación de entrada del modelo:
+    - PerceptronSpam: texto a binario (solo los bits activos si está compactado)
+    - PerceptronRiesgoAcademico: tupla de datos del alumno a binario
+    - Perceptron (numpy): el ejemplo ya es numérico, se deja igual
+    """
+    if hasattr(modelo, "codificar"):
+        return modelo.codificar(ejemplo)
+    if hasattr(modelo, "preparar_entradas"):
+        return modelo.preparar_entradas(*ejemplo)
+    return ejemplo
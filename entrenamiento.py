@@ -0,0 +1,132 @@
+import random
+import time
+
+from checkpoints import guardar_checkpoint
+
+
+def recorrer_filas(entradas):
+    """
+    Recorre las entradas como listas. Si vienen de una matriz de numpy
+    (p. ej. el caché mapeado en memoria) convierte una fila cada vez, así
+    el corpus no se copia entero a memoria y los bucles leen listas, que
+    son mucho más rápidas que elemento a elemento de una matriz.
+    """
+    if hasattr(entradas, "tolist"):
+        return (fila.tolist() for fila in entradas)
+    return entradas
+
+
+def _contar_errores(modelo, entradas, etiquetas):
+    return sum(1 for inputs, etiqueta in zip(recorrer_filas(entradas), etiquetas)
+               if modelo.predecir_codificado(inputs) != etiqueta)
+
+
+def entrenar_epocas(modelo, entradas, etiquetas, max_epocas=100, bolsillo=False, paciencia=None,
+                    tiempo_limite=None, ruta_checkpoint=None, cada_epocas=1, estado=None):
+    """
+    Bucle de entrenamiento del perceptrón compartido por los modelos de una
+    sola capa con listas de pesos (weights, bias, learning_rate y
+    predecir_codificado). Las entradas ya deben estar convertidas a binario.
+
+    bolsillo: si es True, guarda los mejores pesos vistos (algoritmo pocket)
+    y los restaura al terminar si son mejores que los finales.
+    paciencia: número de épocas sin mejorar el mínimo de errores tras el
+    cual se detiene el entrenamiento (None = sin límite).
+    tiempo_limite: segundos disponibles; al agotarse se detiene al final de la época.
+    ruta_checkpoint: archivo donde guardar el estado cada cada_epocas épocas.
+    estado: checkpoint cargado desde el que continuar (con las opciones que tenía).
+
+    Para no contar los errores de todo el corpus en cada época, el bolsillo
+    lleva la racha de ejemplos seguidos bien clasificados sin cambiar los
+    pesos (Gallant): solo cuando una racha supera a la mejor vista se
+    cuentan los errores de los pesos actuales, y pasan al bolsillo si son
+    menos que los guardados.
+    Devuelve True si el entrenamiento terminó y False si se detuvo por tiempo.
+    """
+    inicio = time.monotonic()
+    epoca_inicial = 0
+    racha = 0
+    mejor_racha = 0
+    mejores_errores = None
+    mejores_pesos = None
+    epocas_sin_mejora = 0
+    guarda_indices = hasattr(modelo, "indices_activos")
+
+    if estado is not None:
+        modelo.weights, modelo.bias = estado["weights"], estado["bias"]
+        if guarda_indices:
+            modelo.indices_activos = estado["indices_activos"]
+        random.setstate(estado["rng"])
+        if estado["terminado"]:
+            return True
+        max_epocas, bolsillo, paciencia = estado["max_epocas"], estado["bolsillo"], estado["paciencia"]
+        epoca_inicial, racha, mejor_racha = estado["epoca"], estado["racha"], estado["mejor_racha"]
+        mejores_errores, mejores_pesos = estado["mejores_errores"], estado["mejores_pesos"]
+        epocas_sin_mejora = estado["epocas_sin_mejora"]
+
+    def guardar(epoca, terminado):
+        datos = {
+            "weights": modelo.weights, "bias": modelo.bias, "rng": random.getstate(),
+            "epoca": epoca, "terminado": terminado,
+            "max_epocas": max_epocas, "bolsillo": bolsillo, "paciencia": paciencia,
+            "racha": racha, "mejor_racha": mejor_racha,
+            "mejores_errores": mejores_errores, "mejores_pesos": mejores_pesos,
+            "epocas_sin_mejora": epocas_sin_mejora,
+        }
+        if guarda_indices:
+            datos["indices_activos"] = modelo.indices_activos
+        guardar_checkpoint(ruta_checkpoint, datos)
+
+    seguir_bolsillo = bolsillo or paciencia is not None
+    convergio = False
+    for epoca in range(epoca_inicial, max_epocas):
+        errores = 0
+        mejoro = False
+        for inputs, etiqueta in zip(recorrer_filas(entradas), etiquetas):
+            error = etiqueta - modelo.predecir_codificado(inputs)
+
+            if error == 0:
+                racha += 1
+                continue
+
+            if seguir_bolsillo and racha > mejor_racha:
+                # Los pesos actuales superaron la mejor racha: contar sus errores
+                mejor_racha = racha
+                errores_racha = _contar_errores(modelo, entradas, etiquetas)
+                if mejores_errores is None or errores_racha < mejores_errores:
+                    mejores_errores = errores_racha
+                    mejoro = True
+                    if bolsillo:
+                        mejores_pesos = (list(modelo.weights), modelo.bias)
+
+            racha = 0
+            errores += 1
+            for i in range(len(modelo.weights)):
+                modelo.weights[i] += modelo.learning_rate * error * inputs[i]
+            modelo.bias += modelo.learning_rate * error
+
+        # Si no hay errores, terminar
+        if errores == 0:
+            convergio = True
+            break
+
+        if seguir_bolsillo:
+            epocas_sin_mejora = 0 if mejoro else epocas_sin_mejora + 1
+            if paciencia is not None and epocas_sin_mejora >= paciencia:
+                break
+
+        # Guardar el progreso y parar si se acabó el tiempo
+        tiempo_agotado = tiempo_limite is not None and time.monotonic() - inicio >= tiempo_limite
+        if ruta_checkpoint is not None and ((epoca + 1) % cada_epocas == 0 or tiempo_agotado):
+            guardar(epoca + 1, False)
+        if tiempo_agotado and epoca + 1 < max_epocas:
+            return False
+
+    # Restaurar los pesos del bolsillo si son mejores que los finales
+    if bolsillo and not convergio and mejores_pesos is not None:
+        if mejores_errores < _contar_errores(modelo, entradas, etiquetas):
+            modelo.weights, modelo.bias = mejores_pesos
+
+    if ruta_checkpoint is not None:
+        guardar(max_epocas, True)
+    return True
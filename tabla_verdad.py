@@ -0,0 +1,183 @@
+import time
+
+import numpy as np
+
+from checkpoints import guardar_checkpoint, cargar_checkpoint
+
+# Filas de la tabla que se generan a la vez (limita la memoria usada)
+TAMANO_BLOQUE = 1 << 16
+# Filas que se corrigen juntas al entrenar. Con lotes pequeños hay varias
+# actualizaciones por época y converge en muchas menos épocas que con la tabla entera.
+TAMANO_LOTE = 256
+# Tablas de hasta este número de filas se guardan enteras al entrenar (n <= 20, unos 28 MB)
+MAX_FILAS_EN_MEMORIA = 1 << 20
+# Tope de épocas por defecto al entrenar hasta converger
+MAX_EPOCAS = 10000
+
+
+def generar_tabla(n, inicio=0, fin=None):
+    """
+    Devuelve las filas inicio..fin-1 de la tabla de verdad de n entradas,
+    en el orden habitual: la fila k son los n bits de k (el más significativo primero).
+    Sin inicio ni fin devuelve la tabla completa de 2^n filas.
+    """
+    if fin is None:
+        fin = 1 << n
+    filas = np.arange(inicio, fin, dtype=np.int64)
+    # Llenar columna a columna para no crear una matriz intermedia de int64
+    tabla = np.empty((len(filas), n), dtype=np.uint8)
+    for columna in range(n):
+        tabla[:, columna] = (filas >> (n - 1 - columna)) & 1
+    return tabla
+
+
+def bloques_tabla(n, funcion, tamano_bloque=TAMANO_BLOQUE):
+    """
+    Recorre la tabla de verdad de n entradas por bloques.
+    funcion recibe una matriz de entradas (una fila por combinación) y
+    devuelve la salida de cada fila. Genera pares (entradas, salidas).
+    """
+    total = 1 << n
+    for inicio in range(0, total, tamano_bloque):
+        entradas = generar_tabla(n, inicio, min(inicio + tamano_bloque, total))
+        yield entradas, np.asarray(funcion(entradas), dtype=np.int64)
+
+
+def compuerta_and(entradas):
+    """AND de todas las entradas de cada fila"""
+    return np.all(entradas, axis=1).astype(np.int64)
+
+
+def compuerta_or(entradas):
+    """OR de todas las entradas de cada fila"""
+    return np.any(entradas, axis=1).astype(np.int64)
+
+
+def _entrenar_bloque(perceptron, entradas, salidas, tamano_lote):
+    """
+    Una pasada por lotes sobre un bloque ya generado. Devuelve los errores.
+
+    En vez de evaluar los lotes de uno en uno se evalúa una ventana de
+    varios lotes con los pesos actuales. Si no tiene errores, se avanza y se
+    duplica la ventana. Si los tiene, los lotes anteriores al primer error
+    no habrían cambiado los pesos, así que solo se corrige el lote que lo
+    contiene y la ventana vuelve a un lote. El resultado es el mismo que
+    evaluando lote a lote, con muchas menos operaciones de numpy cuando los
+    pesos ya casi no cambian.
+    """
+    errores = 0
+    total = len(salidas)
+    inicio = 0
+    ventana = tamano_lote
+    while inicio < total:
+        fin = min(inicio + ventana, total)
+        salida_lineal = entradas[inicio:fin] @ perceptron.pesos + perceptron.sesgo
+        error = salidas[inicio:fin] - (salida_lineal >= 0)
+        fallos = np.flatnonzero(error)
+        if len(fallos) == 0:
+            inicio = fin
+            ventana *= 2
+            continue
+
+        # Lote (alineado a tamano_lote) que contiene el primer error
+        desde = fallos[0] // tamano_lote * tamano_lote
+        hasta = min(desde + tamano_lote, fin - inicio)
+        error_lote = error[desde:hasta]
+        lote = entradas[inicio + desde:inicio + hasta]
+
+        errores += np.count_nonzero(error_lote)
+        perceptron.pesos += perceptron.tasa_aprendizaje * (error_lote @ lote)
+        perceptron.sesgo += perceptron.tasa_aprendizaje * error_lote.sum()
+
+        inicio += hasta
+        ventana = tamano_lote
+    return errores
+
+
+def entrenar_tabla(perceptron, n, funcion, max_epocas=MAX_EPOCAS, tamano_lote=TAMANO_LOTE,
+                   tiempo_limite=None, ruta_checkpoint=None, cada_epocas=1, estado=None):
+    """
+    Entrena el perceptrón con la tabla de verdad completa de funcion.
+    Cada lote de filas se evalúa y corrige de una vez (actualización por lotes).
+    Entrena hasta que una época completa no tiene errores, con un tope de
+    max_epocas (AND y OR necesitan unas 150-350 épocas para n entre 8 y 16).
+    Si la tabla tiene hasta MAX_FILAS_EN_MEMORIA filas se genera una sola vez;
+    si no, cada bloque se genera una vez por época.
+
+    tiempo_limite: segundos disponibles; al agotarse se detiene al final de la época.
+    ruta_checkpoint: archivo donde guardar el estado cada cada_epocas épocas,
+    para poder continuar luego con reanudar_tabla.
+    estado: checkpoint cargado desde el que continuar (lo usa reanudar_tabla).
+    Devuelve el número de épocas y si llegó a cero errores (None si se
+    detuvo por tiempo antes de terminar).
+    """
+    if TAMANO_BLOQUE % tamano_lote:
+        raise ValueError("tamano_lote debe dividir a TAMANO_BLOQUE")
+
+    inicio = time.monotonic()
+    if estado is None:
+        perceptron.pesos = np.zeros(n)
+        perceptron.sesgo = 0.0
+        epoca_inicial = 0
+    else:
+        perceptron.pesos, perceptron.sesgo = estado["pesos"], estado["sesgo"]
+        if estado["terminado"]:
+            return estado["epoca"], estado["convergio"]
+        epoca_inicial = estado["epoca"]
+
+    def guardar(epoca, terminado, convergio):
+        guardar_checkpoint(ruta_checkpoint, {
+            "pesos": perceptron.pesos, "sesgo": perceptron.sesgo, "n": n,
+            "max_epocas": max_epocas, "tamano_lote": tamano_lote,
+            "epoca": epoca, "terminado": terminado, "convergio": convergio,
+        })
+
+    bloques = None
+    if (1 << n) <= MAX_FILAS_EN_MEMORIA:
+        bloques = list(bloques_tabla(n, funcion))
+
+    epocas = epoca_inicial
+    convergio = False
+    for epocas in range(epoca_inicial + 1, max_epocas + 1):
+        errores = 0
+        for entradas, salidas in (bloques if bloques is not None else bloques_tabla(n, funcion)):
+            errores += _entrenar_bloque(perceptron, entradas, salidas, tamano_lote)
+
+        # Si no hay errores, terminar
+        if errores == 0:
+            convergio = True
+            break
+
+        # Guardar el progreso y parar si se acabó el tiempo
+        tiempo_agotado = tiempo_limite is not None and time.monotonic() - inicio >= tiempo_limite
+        if ruta_checkpoint is not None and (epocas % cada_epocas == 0 or tiempo_agotado):
+            guardar(epocas, False, None)
+        if tiempo_agotado and epocas < max_epocas:
+            return epocas, None
+
+    if ruta_checkpoint is not None:
+        guardar(epocas, True, convergio)
+    return epocas, convergio
+
+
+def reanudar_tabla(perceptron, ruta_checkpoint, funcion, tiempo_limite=None, cada_epocas=1):
+    """
+    Continúa un entrenamiento de entrenar_tabla desde su último checkpoint,
+    con el mismo n, max_epocas y tamano_lote que tenía. funcion debe ser la
+    misma compuerta con la que se empezó.
+    """
+    estado = cargar_checkpoint(ruta_checkpoint)
+    return entrenar_tabla(perceptron, estado["n"], funcion, estado["max_epocas"], estado["tamano_lote"],
+                          tiempo_limite, ruta_checkpoint, cada_epocas, estado)
+
+
+def evaluar_tabla(perceptron, n, funcion, tamano_bloque=TAMANO_BLOQUE):
+    """
+    Cuenta cuántas filas de la tabla de verdad acierta el perceptrón,
+    en una sola pasada. Si acierta las 2^n filas, funcion es linealmente
+    separable y el perceptrón la representa exactamente.
+    """
+    aciertos = 0
+    for entradas, salidas in bloques_tabla(n, funcion, tamano_bloque):
+        aciertos += np.count_nonzero(perceptron.predecir(entradas) == salidas)
+    return aciertos
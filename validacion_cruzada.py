@@ -0,0 +1,134 @@
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from codificacion import codificar
+
+# Datos ya codificados, compartidos por todos los pliegues de un proceso
+_entradas = None
+_etiquetas = None
+
+
+def pliegues_estratificados(etiquetas, k=5, semilla=None):
+    """
+    Reparte los índices de los ejemplos en k pliegues manteniendo
+    la proporción de cada clase en todos ellos.
+    """
+    if k < 2 or k > len(etiquetas):
+        raise ValueError("k debe estar entre 2 y el número de ejemplos")
+
+    generador = random.Random(semilla)
+    por_clase = {}
+    for indice, etiqueta in enumerate(etiquetas):
+        por_clase.setdefault(etiqueta, []).append(indice)
+
+    # Repartir cada clase por turnos, continuando donde terminó la anterior
+    pliegues = [[] for _ in range(k)]
+    turno = 0
+    for clase in sorted(por_clase):
+        indices = por_clase[clase]
+        generador.shuffle(indices)
+        for indice in indices:
+            pliegues[turno % k].append(indice)
+            turno += 1
+    return pliegues
+
+
+def _iniciar_proceso(entradas, etiquetas):
+    """Guarda los datos codificados en el proceso de trabajo (una sola vez)"""
+    global _entradas, _etiquetas
+    _entradas = entradas
+    _etiquetas = etiquetas
+
+
+def _entrenar(modelo, entradas, etiquetas, opciones):
+    if hasattr(modelo, "entrenar_codificado"):
+        modelo.entrenar_codificado(entradas, etiquetas, **opciones)
+    else:
+        # Perceptron de numpy: se importa solo cuando hace falta
+        import numpy as np
+        modelo.entrenar(np.array(entradas), np.array(etiquetas), **opciones)
+
+
+def _predecir(modelo, entradas):
+    if hasattr(modelo, "predecir_codificado"):
+        return [modelo.predecir_codificado(inputs) for inputs in entradas]
+    import numpy as np
+    return list(modelo.predecir(np.array(entradas)))
+
+
+def _evaluar_pliegue(crear_modelo, numero, prueba, semilla, opciones):
+    """Entrena con todos los pliegues menos uno y evalúa con el restante"""
+    inicio = time.perf_counter()
+    if semilla is not None:
+        random.seed(semilla + numero)
+
+    en_prueba = set(prueba)
+    entrenamiento = [i for i in range(len(_etiquetas)) if i not in en_prueba]
+
+    modelo = crear_modelo()
+    _entrenar(modelo,
+              [_entradas[i] for i in entrenamiento],
+              [_etiquetas[i] for i in entrenamiento],
+              opciones)
+    tiempo_entrenamiento = time.perf_counter() - inicio
+
+    predicciones = _predecir(modelo, [_entradas[i] for i in prueba])
+    reales = [_etiquetas[i] for i in prueba]
+
+    verdaderos_pos = sum(1 for p, r in zip(predicciones, reales) if p == 1 and r == 1)
+    falsos_pos = sum(1 for p, r in zip(predicciones, reales) if p == 1 and r == 0)
+    falsos_neg = sum(1 for p, r in zip(predicciones, reales) if p == 0 and r == 1)
+    aciertos = sum(1 for p, r in zip(predicciones, reales) if p == r)
+
+    return {
+        "pliegue": numero,
+        "ejemplos_prueba": len(prueba),
+        "exactitud": aciertos / len(prueba),
+        "precision": verdaderos_pos / (verdaderos_pos + falsos_pos) if verdaderos_pos + falsos_pos else 0.0,
+        "exhaustividad": verdaderos_pos / (verdaderos_pos + falsos_neg) if verdaderos_pos + falsos_neg else 0.0,
+        "tiempo_entrenamiento": tiempo_entrenamiento,
+        "tiempo_total": time.perf_counter() - inicio,
+    }
+
+
+def validacion_cruzada(crear_modelo, ejemplos, etiquetas, k=5, procesos=None, semilla=None, **opciones):
+    """
+    Validación cruzada estratificada de k pliegues.
+
+    crear_modelo: función sin argumentos que devuelve un perceptrón nuevo
+    (por ejemplo la clase, o functools.partial(PerceptronSpam, max_length=80)).
+    procesos: número de procesos de trabajo (None = uno por pliegue, hasta
+    el número de CPUs; 1 = sin procesos adicionales).
+    opciones: argumentos extra para el entrenamiento (max_epocas, bolsillo...).
+
+    Cada ejemplo se codifica una sola vez y los pliegues se entrenan en
+    paralelo. Devuelve una lista con las métricas de cada pliegue.
+    """
+    pliegues = pliegues_estratificados(etiquetas, k, semilla)
+
+    # Codificar todos los ejemplos una sola vez con un modelo de referencia
+    referencia = crear_modelo()
+    entradas = [codificar(referencia, ejemplo) for ejemplo in ejemplos]
+    etiquetas = list(etiquetas)
+
+    if procesos is None:
+        procesos = min(k, os.cpu_count() or 1)
+
+    if procesos == 1:
+        _iniciar_proceso(entradas, etiquetas)
+        return [_evaluar_pliegue(crear_modelo, numero, prueba, semilla, opciones)
+                for numero, prueba in enumerate(pliegues)]
+
+    with ProcessPoolExecutor(max_workers=procesos, initializer=_iniciar_proceso,
+                             initargs=(entradas, etiquetas)) as ejecutor:
+        tareas = [ejecutor.submit(_evaluar_pliegue, crear_modelo, numero, prueba, semilla, opciones)
+                  for numero, prueba in enumerate(pliegues)]
+        return [tarea.result() for tarea in tareas]
+
+
+def resumen(resultados):
+    """Promedia las métricas de todos los pliegues"""
+    metricas = ["exactitud", "precision", "exhaustividad", "tiempo_entrenamiento", "tiempo_total"]
+    return {metrica: sum(r[metrica] for r in resultados) / len(resultados) for metrica in metricas}